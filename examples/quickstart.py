@@ -1,4 +1,5 @@
 import asyncio
+from contextlib import asynccontextmanager
 from decimal import Decimal
 
 from fastapi import FastAPI, status
@@ -13,8 +14,16 @@ settings = QPaySettings.sandbox()
 # Init async client
 client = AsyncQPayClient(settings=settings)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Release the pooled connections on shutdown
+    yield
+    await client.aclose()
+
+
 # init FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Just a dummy db
 payment_database = {}
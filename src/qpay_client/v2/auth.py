@@ -1,6 +1,7 @@
 """QPay client authentication state module."""
 
 import time
+from base64 import b64encode
 from dataclasses import dataclass
 
 from .error import AuthError
@@ -11,6 +12,11 @@ def _normalize_to_capital(token_type: str) -> str:
     return token_type.capitalize()
 
 
+def basic_auth_header(username: str, password: str) -> str:
+    """Encode credentials as an HTTP Basic ``Authorization`` header value."""
+    return "Basic " + b64encode(f"{username}:{password}".encode()).decode("ascii")
+
+
 @dataclass()
 class QpayAuthState:
     """Contains authentication information about the client."""
@@ -54,6 +60,15 @@ class QpayAuthState:
         """
         return time.time() >= self.access_token_expiry_at - leeway
 
+    def is_access_valid(self, leeway: float = 60) -> bool:
+        """
+        Return True if an access token is present and not expired.
+
+        Single-check fast path used before every request; equivalent to
+        ``has_access_token() and not is_access_expired(leeway)``.
+        """
+        return bool(self.access_token) and time.time() < self.access_token_expiry_at - leeway
+
     def is_refresh_expired(self, leeway: float = 60) -> bool:
         """
         Return True if the refresh token is expired.
@@ -64,6 +79,10 @@ class QpayAuthState:
         """
         return time.time() >= self.refresh_token_expiry_at - leeway
 
+    def invalidate_access(self) -> None:
+        """Mark the access token as expired so the next check refreshes it."""
+        self.access_token_expiry_at = 0
+
     def update(self, token_response: TokenResponse) -> None:
         """Used to update token states with token_response."""
         # QPay seem to return lowercase token type
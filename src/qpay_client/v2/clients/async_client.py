@@ -1,9 +1,11 @@
 import asyncio
 import logging
-from typing import Optional, Union
+import time
+from typing import Awaitable, Callable, Iterable, Optional, TypeVar, Union
 
-from httpx import AsyncClient, BasicAuth, Response
+from httpx import AsyncClient, Response
 
+from ..error import QPayError
 from ..schemas import (
     EbarimtCreateRequest,
     EbarimtCreateResponse,
@@ -27,6 +29,9 @@ from ..transport import AsyncTransport
 from .base import BaseClient
 from .decorators import async_auth_required, async_poll_until_paid
 
+A = TypeVar("A")
+T = TypeVar("T")
+
 
 class AsyncQPayClient(BaseClient):
     """
@@ -47,10 +52,32 @@ class AsyncQPayClient(BaseClient):
     ``payment_list``, ``ebarimt_create``, ``ebarimt_get``,
     ``subscription_get``, ``subscription_cancel``.
 
-    Concurrency-safe: ``authenticate()`` is guarded by an ``asyncio.Lock``,
-    so multiple coroutines sharing one client instance will not race on token refresh.
+    Batch helpers ``invoice_create_many``, ``invoice_get_many``,
+    ``payment_check_many``, ``payment_get_many`` and ``payment_list_many`` run
+    many calls concurrently over the shared connection pool and return the
+    results in input order. The first failure cancels the rest of the batch.
+
+    Several clients (e.g. one per merchant) can share one connection pool by
+    injecting the same ``httpx.AsyncClient``. An injected client is not closed
+    by ``close()``; whoever created it closes it::
+
+        http = httpx.AsyncClient(base_url=SANDBOX_URL, limits=default_limits())
+        merchant_a = AsyncQPayClient(settings_a, client=http)
+        merchant_b = AsyncQPayClient(settings_b, client=http)
+        ...
+        await http.aclose()
+
+    Concurrency-safe: token fetches are single-flight. Coroutines that need a
+    token while one is being fetched await the same in-flight task instead of
+    issuing their own ``/auth/token`` or ``/auth/refresh`` call. Once the access
+    token is within ``2 * token_leeway`` of expiry it is refreshed in the
+    background while requests keep using the still-valid token. A failed
+    background refresh is not retried for a few seconds.
     """
 
+    # Seconds to wait before retrying a failed background refresh
+    _REFRESH_AHEAD_COOLDOWN = 5.0
+
     def __init__(
         self,
         settings: QPaySettings,
@@ -63,7 +90,7 @@ class AsyncQPayClient(BaseClient):
 
         Args:
             settings (Settings): QPay client settings.
-            client (Optional[httpx.Client]): Optional custom httpx client.
+            client (Optional[httpx.AsyncClient]): Optional shared httpx client. Not closed by this client.
             logger (Optional[logging.Logger]): QPay client logger.
 
         """
@@ -71,7 +98,13 @@ class AsyncQPayClient(BaseClient):
         self._transport = AsyncTransport(settings=settings, logger=self._logger, client=client)
         self._client = self._transport.client
 
-        self._async_lock = asyncio.Lock()
+        # Default batch concurrency; the limits of an injected client are unknown
+        self._batch_limit = settings.limits.max_connections if client is None else None
+
+        self._auth_inflight: Optional["asyncio.Future[None]"] = None
+        # Tokens within twice the leeway of expiry are refreshed in the background
+        self._refresh_ahead_leeway = 2 * self._token_leeway
+        self._refresh_ahead_retry_at = 0.0  # monotonic time before which a failed refresh-ahead is not retried
 
     @property
     def is_closed(self) -> bool:
@@ -86,18 +119,63 @@ class AsyncQPayClient(BaseClient):
 
     async def close(self):
         """Close connection."""
+        if self._auth_inflight is not None and not self._auth_inflight.done():
+            self._auth_inflight.cancel()
         await self._transport.close()
 
+    async def aclose(self):
+        """Close connection. Alias of ``close`` matching ``httpx.AsyncClient.aclose``."""
+        await self.close()
+
     async def authenticate(self) -> None:
         """Authenticate client."""
-        async with self._async_lock:
-            if self.is_authenticated:
-                return  # no need to reauthenticate
-
-            if not self._auth_state.has_access_token() or self.is_refresh_expired:
-                await self._authenticate_nolock()  # first token or refresh token expired
-            else:
-                await self._refresh_access_token_nolock()
+        if self.is_authenticated:
+            if self._auth_state.is_access_expired(leeway=self._refresh_ahead_leeway):
+                self._refresh_ahead()  # still valid but aging; refresh without blocking
+            return  # no need to reauthenticate
+
+        await self._single_flight(self._authenticate_or_refresh_nolock)
+
+    def _refresh_ahead(self) -> None:
+        """Start a background refresh so callers never block on an expiring token."""
+        if self._auth_inflight is not None and not self._auth_inflight.done():
+            return  # a fetch is already running
+        if time.monotonic() < self._refresh_ahead_retry_at:
+            return  # the last one failed; the blocking path takes over once the token enters the leeway
+
+        self._logger.debug("Access token close to expiry, refreshing in background")
+        self._auth_inflight = asyncio.ensure_future(
+            self._refresh_access_token_nolock(leeway=self._refresh_ahead_leeway)
+        )
+        self._auth_inflight.add_done_callback(self._log_refresh_ahead_failure)
+
+    def _log_refresh_ahead_failure(self, task: "asyncio.Future[None]") -> None:
+        if not task.cancelled() and task.exception() is not None:
+            # The token is still valid; back off instead of hitting a failing auth server on every call
+            self._refresh_ahead_retry_at = time.monotonic() + self._REFRESH_AHEAD_COOLDOWN
+            self._logger.warning(
+                "Background token refresh failed, retrying in %.0f s: %s",
+                self._REFRESH_AHEAD_COOLDOWN,
+                task.exception(),
+            )
+
+    async def _single_flight(self, fetch: Callable[[], Awaitable[None]]) -> None:
+        """Run ``fetch`` unless a token fetch is already in flight, then await the shared task."""
+        inflight = self._auth_inflight
+        if inflight is None or inflight.done():
+            inflight = asyncio.ensure_future(fetch())
+            self._auth_inflight = inflight
+        # shield: a cancelled caller must not cancel the fetch other callers are awaiting
+        await asyncio.shield(inflight)
+
+    async def _authenticate_or_refresh_nolock(self) -> None:
+        if self.is_authenticated:
+            return  # updated while this task was scheduled
+
+        if not self._auth_state.has_access_token() or self.is_refresh_expired:
+            await self._authenticate_nolock()  # first token or refresh token expired
+        else:
+            await self._refresh_access_token_nolock()
 
     async def _request(
         self,
@@ -108,72 +186,77 @@ class AsyncQPayClient(BaseClient):
         return await self._transport.request(
             method,
             url,
-            on_unauthorized=self._refresh_access_token,
+            on_unauthorized=self._on_unauthorized,
             **kwargs,
         )
 
+    async def _on_unauthorized(self, rejected: Optional[str]) -> dict[str, str]:
+        """Refresh a token the server rejected and return headers for the replay."""
+        # A staggered 401 for a token another coroutine already replaced just replays with the new one
+        if self._is_current_authorization(rejected):
+            # The token may still look valid locally (clock skew, server-side revocation)
+            self._auth_state.invalidate_access()
+            await self._refresh_access_token()
+        return self.headers()
+
     async def _send(self, method: str, url: str, **kwargs) -> Response:
         return await self._transport._send(method, url, **kwargs)
 
     async def _authenticate(self) -> None:
-        """Authenticate the client. Thread safe."""
-        # locked wrapper
-        async with self._async_lock:
-            await self._authenticate_nolock()
+        """Authenticate the client. Concurrency safe."""
+        await self._single_flight(self._authenticate_nolock)
 
     async def _refresh_access_token(self) -> None:
-        """Refresh client access. Thread safe."""
-        # locked wrapper
-        async with self._async_lock:
-            await self._refresh_access_token_nolock()
+        """Refresh client access. Concurrency safe."""
+        await self._single_flight(self._refresh_access_token_nolock)
 
     async def _authenticate_nolock(self):
-        """Authenticate the client. Not thread safe."""
-        response = await self._send(
+        """Authenticate the client. Not concurrency safe."""
+        # No 401 handler here: a rejected login must raise, not try to re-login
+        response = await self._transport.request(
             "POST",
             "/auth/token",
-            auth=BasicAuth(
-                username=self._settings.username,
-                password=self._settings.password,  # get password secret
-            ),
+            headers={"Authorization": self._basic_auth_header},
         )
 
-        token_response = TokenResponse.model_validate(response.json())
+        token_response = TokenResponse.model_validate_json(response.content)
 
         self._auth_state.update(token_response)
 
-    async def _refresh_access_token_nolock(self):
-        """Refresh client access. Not thread safe."""
-        if not self._auth_state.is_access_expired(leeway=self._token_leeway):
+    async def _refresh_access_token_nolock(self, leeway: Optional[float] = None):
+        """Refresh client access if it expires within ``leeway`` seconds. Not concurrency safe."""
+        if not self._auth_state.is_access_expired(leeway=self._token_leeway if leeway is None else leeway):
             return  # access token not expired
 
         if self._auth_state.is_refresh_expired(leeway=self._token_leeway):
             return await self._authenticate_nolock()
 
-        # Using refresh token
-        response = await self._send(
-            "POST",
-            "/auth/refresh",
-            headers={"Authorization": self._auth_state.refresh_as_header()},
-        )
+        # No 401 handler here either, but network errors and 5xx are still retried and wrapped
+        try:
+            response = await self._transport.request(
+                "POST",
+                "/auth/refresh",
+                headers={"Authorization": self._auth_state.refresh_as_header()},
+            )
+        except QPayError as exc:
+            if not 400 <= exc.status_code < 500:
+                raise
+            return await self._authenticate_nolock()  # refresh token rejected, log in again
 
-        if response.is_success:
-            token_response = TokenResponse.model_validate(response.json())
+        token_response = TokenResponse.model_validate_json(response.content)
 
-            self._auth_state.update(token_response)
-        else:
-            await self._authenticate_nolock()
+        self._auth_state.update(token_response)
 
     @async_auth_required
     async def invoice_get(self, invoice_id: str) -> InvoiceGetResponse:
         """Get invoice by Id."""
         response = await self._request(
             "GET",
-            f"/invoice/{invoice_id}",
+            self._route(self._INVOICE_PATH, invoice_id),
             headers=self.headers(),
         )
 
-        data = InvoiceGetResponse.model_validate(response.json())
+        data = InvoiceGetResponse.model_validate_json(response.content)
         return data
 
     @async_auth_required
@@ -185,10 +268,10 @@ class AsyncQPayClient(BaseClient):
             "POST",
             "/invoice",
             headers=self.headers(),
-            json=self._invoice_create_payload(create_invoice_request),
+            content=self._invoice_create_payload(create_invoice_request),
         )
 
-        data = InvoiceCreateResponse.model_validate(response.json())
+        data = InvoiceCreateResponse.model_validate_json(response.content)
         return data
 
     @async_auth_required
@@ -199,7 +282,7 @@ class AsyncQPayClient(BaseClient):
         """Send cancel invoice request to qpay. Returns status code."""
         response = await self._request(
             "DELETE",
-            f"/invoice/{invoice_id}",
+            self._route(self._INVOICE_PATH, invoice_id),
             headers=self.headers(),
         )
 
@@ -210,24 +293,28 @@ class AsyncQPayClient(BaseClient):
         """Send get payment requesst to qpay."""
         response = await self._request(
             "GET",
-            f"/payment/{payment_id}",
+            self._route(self._PAYMENT_PATH, payment_id),
             headers=self.headers(),
         )
 
-        data = PaymentGetResponse.model_validate(response.json())
+        data = PaymentGetResponse.model_validate_json(response.content)
         return data
 
     @async_auth_required
-    @async_poll_until_paid
     async def payment_check(self, payment_check_request: PaymentCheckRequest) -> PaymentCheckResponse:
         """Check payment status, polling until a payment is found or retries exhausted."""
+        # Serialize once; the body is reused for every poll attempt
+        return await self._payment_check(self._serialize(payment_check_request))
+
+    @async_poll_until_paid
+    async def _payment_check(self, body: bytes) -> PaymentCheckResponse:
         response = await self._request(
             "POST",
             "/payment/check",
             headers=self.headers(),
-            json=payment_check_request.model_dump(by_alias=True, exclude_none=True, mode="json"),
+            content=body,
         )
-        return PaymentCheckResponse.model_validate(response.json())
+        return PaymentCheckResponse.model_validate_json(response.content)
 
     @async_auth_required
     async def payment_cancel(
@@ -238,9 +325,9 @@ class AsyncQPayClient(BaseClient):
         """Send payment cancel request. Returns status code."""
         response = await self._request(
             "DELETE",
-            f"/payment/cancel/{payment_id}",
+            self._route(self._PAYMENT_CANCEL_PATH, payment_id),
             headers=self.headers(),
-            json=payment_cancel_request.model_dump(by_alias=True, exclude_none=True, mode="json"),
+            content=self._serialize(payment_cancel_request),
         )
 
         return response.status_code
@@ -254,9 +341,9 @@ class AsyncQPayClient(BaseClient):
         """Send refund payment request. Returns status code."""
         response = await self._request(
             "DELETE",
-            f"/payment/refund/{payment_id}",
+            self._route(self._PAYMENT_REFUND_PATH, payment_id),
             headers=self.headers(),
-            json=payment_refund_request.model_dump(by_alias=True, exclude_none=True, mode="json"),
+            content=self._serialize(payment_refund_request),
         )
 
         return response.status_code
@@ -268,10 +355,10 @@ class AsyncQPayClient(BaseClient):
             "POST",
             "/payment/list",
             headers=self.headers(),
-            json=payment_list_request.model_dump(by_alias=True, exclude_none=True, mode="json"),
+            content=self._serialize(payment_list_request),
         )
 
-        data = PaymentListResponse.model_validate(response.json())
+        data = PaymentListResponse.model_validate_json(response.content)
         return data
 
     @async_auth_required
@@ -281,10 +368,10 @@ class AsyncQPayClient(BaseClient):
             "POST",
             "/ebarimt/create",
             headers=self.headers(),
-            json=ebarimt_create_request.model_dump(by_alias=True, exclude_none=True, mode="json"),
+            content=self._serialize(ebarimt_create_request),
         )
 
-        data = EbarimtCreateResponse.model_validate(response.json())
+        data = EbarimtCreateResponse.model_validate_json(response.content)
         return data
 
     @async_auth_required
@@ -292,11 +379,11 @@ class AsyncQPayClient(BaseClient):
         """Send get ebarimt request."""
         response = await self._request(
             "GET",
-            f"/ebarimt/{barimt_id}",
+            self._route(self._EBARIMT_PATH, barimt_id),
             headers=self.headers(),
         )
 
-        data = EbarimtGetResponse.model_validate(response.json())
+        data = EbarimtGetResponse.model_validate_json(response.content)
         return data
 
     @async_auth_required
@@ -304,11 +391,11 @@ class AsyncQPayClient(BaseClient):
         """Send get subscription request."""
         response = await self._request(
             "GET",
-            f"/subscription/{subscription_id}",
+            self._route(self._SUBSCRIPTION_PATH, subscription_id),
             headers=self.headers(),
         )
 
-        data = SubscriptionGetResponse.model_validate(response.json())
+        data = SubscriptionGetResponse.model_validate_json(response.content)
         return data
 
     @async_auth_required
@@ -316,8 +403,91 @@ class AsyncQPayClient(BaseClient):
         """Send cancel subscription request."""
         response = await self._request(
             "DELETE",
-            f"/subscription/{subscription_id}",
+            self._route(self._SUBSCRIPTION_PATH, subscription_id),
             headers=self.headers(),
         )
 
         return response.status_code
+
+    async def _gather(
+        self, call: Callable[[A], Awaitable[T]], args: Iterable[A], limit: Optional[int] = None
+    ) -> list[T]:
+        """
+        Await ``call(arg)`` for every arg concurrently, at most ``limit`` at a time, preserving order.
+
+        ``limit`` defaults to the pool size of the client this instance created, so a
+        large batch queues here instead of hitting pool timeouts. An unlimited pool
+        or an injected ``httpx.AsyncClient`` (whose limits are not visible here) has
+        no default cap.
+
+        The first failure cancels the calls still running or queued and is raised.
+        Calls that already finished are not undone; to keep every outcome, gather the
+        single-call methods yourself with ``return_exceptions=True``.
+        """
+        if limit is None:
+            limit = self._batch_limit
+        elif limit < 1:
+            raise ValueError(f"limit must be at least 1, got {limit}")
+        semaphore = asyncio.Semaphore(limit) if limit is not None else None
+
+        async def bounded(arg: A) -> T:
+            # The call is only created once a slot is free, so a cancelled queued call leaves nothing unawaited
+            if semaphore is None:
+                return await call(arg)
+            async with semaphore:
+                return await call(arg)
+
+        tasks = [asyncio.ensure_future(bounded(arg)) for arg in args]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            # gather leaves the other tasks running; stop them (e.g. payment_check polling)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def invoice_create_many(
+        self,
+        create_invoice_requests: Iterable[Union[InvoiceCreateRequest, InvoiceCreateSimpleRequest]],
+        *,
+        limit: Optional[int] = None,
+    ) -> list[InvoiceCreateResponse]:
+        """Create several invoices concurrently. Results are in request order."""
+        return await self._gather(self.invoice_create, create_invoice_requests, limit)
+
+    async def invoice_get_many(
+        self,
+        invoice_ids: Iterable[str],
+        *,
+        limit: Optional[int] = None,
+    ) -> list[InvoiceGetResponse]:
+        """Get several invoices concurrently. Results are in ``invoice_ids`` order."""
+        return await self._gather(self.invoice_get, invoice_ids, limit)
+
+    async def payment_check_many(
+        self,
+        payment_check_requests: Iterable[PaymentCheckRequest],
+        *,
+        limit: Optional[int] = None,
+    ) -> list[PaymentCheckResponse]:
+        """Check several payments concurrently. Results are in request order."""
+        return await self._gather(self.payment_check, payment_check_requests, limit)
+
+    async def payment_get_many(
+        self,
+        payment_ids: Iterable[str],
+        *,
+        limit: Optional[int] = None,
+    ) -> list[PaymentGetResponse]:
+        """Get several payments concurrently. Results are in ``payment_ids`` order."""
+        return await self._gather(self.payment_get, payment_ids, limit)
+
+    async def payment_list_many(
+        self,
+        payment_list_requests: Iterable[PaymentListRequest],
+        *,
+        limit: Optional[int] = None,
+    ) -> list[PaymentListResponse]:
+        """List payments for several objects concurrently. Results are in request order."""
+        return await self._gather(self.payment_list, payment_list_requests, limit)
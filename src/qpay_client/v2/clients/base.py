@@ -1,28 +1,37 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Union
+from urllib.parse import quote
 
-from httpx import Headers
 from pydantic import BaseModel
 
-from ..auth import QpayAuthState
+from ..auth import QpayAuthState, basic_auth_header
 from ..settings import QPaySettings
 
 
 class BaseClient(ABC):
     """
-    Synchronous client for QPay v2 API.
+    Shared base of ``QPayClient`` and ``AsyncQPayClient`` for the QPay v2 API.
 
-    This client handles authentication, token refresh, and provides async
-    methods for interacting with QPay v2 endpoints (invoices, payments,
-    subscriptions, and ebarimt). It is designed to follow the official QPay v2.
+    Holds the settings, token state, request headers and route helpers that
+    both clients use. The endpoint methods and HTTP transport live in the
+    subclasses.
 
     Note:
-        QPayClientSync is not thread-safe.
-        Use one instance per thread or protect externally.
+        Concurrency guarantees differ per client: ``QPayClient`` can be shared
+        between threads and ``AsyncQPayClient`` between coroutines. See each
+        client's docstring.
 
     """
 
+    # Route templates for endpoints that take a path parameter
+    _INVOICE_PATH = "/invoice/{}"
+    _PAYMENT_PATH = "/payment/{}"
+    _PAYMENT_CANCEL_PATH = "/payment/cancel/{}"
+    _PAYMENT_REFUND_PATH = "/payment/refund/{}"
+    _EBARIMT_PATH = "/ebarimt/{}"
+    _SUBSCRIPTION_PATH = "/subscription/{}"
+
     def __init__(
         self,
         settings: QPaySettings,
@@ -47,6 +56,13 @@ class BaseClient(ABC):
         self._base_url = self._settings.base_url
         self._token_leeway = self._settings.token_leeway
 
+        # Credentials are fixed for the client lifetime, so encode them once
+        self._basic_auth_header = basic_auth_header(self._settings.username, self._settings.password)
+
+        # Headers are rebuilt only when the access token changes
+        self._cached_headers: Optional[dict[str, str]] = None
+        self._cached_token: Optional[str] = None
+
         # Logging config
         self._logger = logger or logging.getLogger(f"qpay.{self._id}")
         self._logger.setLevel(settings.log_level)
@@ -56,7 +72,7 @@ class BaseClient(ABC):
     @property
     def is_authenticated(self) -> bool:
         """Returns True of authenticated and not expired."""
-        return self._auth_state.has_access_token() and not self.is_access_expired
+        return self._auth_state.is_access_valid(leeway=self._token_leeway)
 
     @property
     def is_access_expired(self) -> bool:
@@ -82,24 +98,49 @@ class BaseClient(ABC):
     def auth_state(self) -> QpayAuthState:
         return self._auth_state
 
-    def headers(self):
-        """Headers needed for communication between qpay client and qpay server."""
-        header = Headers(
-            {
+    def headers(self) -> dict[str, str]:
+        """
+        Headers needed for communication between qpay client and qpay server.
+
+        Returned as a plain dict (httpx merges it into the request without an
+        extra ``Headers`` wrapper). The dict is cached and only rebuilt when the
+        access token changes, so it must not be mutated by the caller.
+        """
+        token = self.token if self.is_authenticated else None
+        if self._cached_headers is None or token != self._cached_token:
+            header = {
                 "Accept": "application/json",
                 "Content-Type": "application/json",
                 "User-Agent": "qpay-client",
             }
-        )
-        if self.is_authenticated:
-            header.update({"Authorization": f"Bearer {self.token}"})
-        return header
-
-    def _invoice_create_payload(self, request_model: BaseModel) -> dict:
+            if token:
+                header["Authorization"] = f"Bearer {token}"
+            self._cached_headers = header
+            self._cached_token = token
+        return self._cached_headers
+
+    def _is_current_authorization(self, authorization: Optional[str]) -> bool:
+        """Whether ``authorization`` carries the access token held now, i.e. nobody has replaced it yet."""
+        if authorization is None or not self._auth_state.has_access_token():
+            return True
+        return authorization == f"Bearer {self._auth_state.get_access_token()}"
+
+    @staticmethod
+    def _route(template: str, path_param: Union[str, int]) -> str:
+        """Fill a route template, percent-encoding the parameter so ``/`` or non-ASCII ids stay one segment."""
+        # str() first: numeric ids (e.g. QPay payment ids) were accepted before encoding was added
+        return template.format(quote(str(path_param), safe=""))
+
+    @staticmethod
+    def _serialize(request_model: BaseModel) -> bytes:
+        """Serialize a request model straight to JSON bytes, skipping the intermediate dict."""
+        return request_model.model_dump_json(by_alias=True, exclude_none=True).encode()
+
+    def _invoice_create_payload(self, request_model: BaseModel) -> bytes:
         """Build invoice-create payload and default invoice_code from settings when omitted."""
-        payload = request_model.model_dump(by_alias=True, exclude_none=True, mode="json")
-        payload.setdefault("invoice_code", self._settings.invoice_code)
-        return payload
+        if getattr(request_model, "invoice_code", None) is None:
+            request_model = request_model.model_copy(update={"invoice_code": self._settings.invoice_code})
+        return self._serialize(request_model)
 
     @property
     @abstractmethod
@@ -1,8 +1,10 @@
 import logging
+import threading
 from typing import Optional, Union
 
-from httpx import BasicAuth, Client, Response
+from httpx import Client, Response
 
+from ..error import QPayError
 from ..schemas import (
     EbarimtCreateRequest,
     EbarimtCreateResponse,
@@ -46,7 +48,11 @@ class QPayClient(BaseClient):
     ``payment_list``, ``ebarimt_create``, ``ebarimt_get``,
     ``subscription_get``, ``subscription_cancel``.
 
-    Not thread-safe. Use one instance per thread or protect access with a lock.
+    Pass ``client=httpx.Client(...)`` to share one connection pool between
+    several clients. An injected client is not closed by ``close()``.
+
+    Token fetches are serialized with a lock, so one instance can be shared
+    between threads: when the token expires, only one thread refreshes it.
     """
 
     def __init__(
@@ -61,13 +67,14 @@ class QPayClient(BaseClient):
 
         Args:
             settings (Settings): QPay client settings.
-            client (Optional[httpx.Client]): Optional custom httpx client.
+            client (Optional[httpx.Client]): Optional shared httpx client. Not closed by this client.
             logger (Optional[logging.Logger]): QPay client logger.
 
         """
         super().__init__(settings, logger=logger)
         self._transport = SyncTransport(settings=settings, logger=self._logger, client=client)
         self._client = self._transport.client
+        self._auth_lock = threading.Lock()
 
     @property
     def is_closed(self) -> bool:
@@ -88,10 +95,13 @@ class QPayClient(BaseClient):
         """Authenticate client."""
         if self.is_authenticated:
             return  # Fast exit
-        if not self._auth_state.has_access_token() or self.is_refresh_expired:
-            self._authenticate()
-        else:
-            self._refresh_access_token()
+        with self._auth_lock:
+            if self.is_authenticated:
+                return  # another thread refreshed while we waited
+            if not self._auth_state.has_access_token() or self.is_refresh_expired:
+                self._authenticate()
+            else:
+                self._refresh_access_token()
 
     def _send(
         self,
@@ -110,10 +120,20 @@ class QPayClient(BaseClient):
         return self._transport.request(
             method,
             url,
-            on_unauthorized=self._refresh_access_token,
+            on_unauthorized=self._on_unauthorized,
             **kwargs,
         )
 
+    def _on_unauthorized(self, rejected: Optional[str]) -> dict[str, str]:
+        """Refresh a token the server rejected and return headers for the replay."""
+        with self._auth_lock:
+            # Another thread may already have replaced the token this request was sent with
+            if self._is_current_authorization(rejected):
+                # The token may still look valid locally (clock skew, server-side revocation)
+                self._auth_state.invalidate_access()
+                self._refresh_access_token()
+        return self.headers()
+
     def _authenticate(self):
         """
         Used for server authentication.
@@ -123,16 +143,14 @@ class QPayClient(BaseClient):
             The client manages the tokens.
 
         """
-        response = self._request(
+        # No 401 handler here: a rejected login must raise, not try to re-login
+        response = self._transport.request(
             "POST",
             "/auth/token",
-            auth=BasicAuth(
-                username=self._settings.username,
-                password=self._settings.password,
-            ),
+            headers={"Authorization": self._basic_auth_header},
         )
 
-        token_response = TokenResponse.model_validate(response.json())
+        token_response = TokenResponse.model_validate_json(response.content)
 
         self._auth_state.update(token_response)
 
@@ -144,23 +162,25 @@ class QPayClient(BaseClient):
             self._authenticate()
             return
 
-        response = self._request(
-            "POST", "/auth/refresh", headers={"Authorization": self._auth_state.refresh_as_header()}
-        )
-
-        if response.is_success:
-            token_response = TokenResponse.model_validate(response.json())
+        # No 401 handler here either, but network errors and 5xx are still retried and wrapped
+        try:
+            response = self._transport.request(
+                "POST",
+                "/auth/refresh",
+                headers={"Authorization": self._auth_state.refresh_as_header()},
+            )
+        except QPayError as exc:
+            if not 400 <= exc.status_code < 500:
+                raise
+            self._authenticate()  # refresh token rejected, log in again
+            return
 
-            self._auth_state.update(token_response)
+        token_response = TokenResponse.model_validate_json(response.content)
 
-        else:
-            self._authenticate()
+        self._auth_state.update(token_response)
 
     def get_token(self) -> str:
-        if not self._auth_state.has_access_token() or self._auth_state.is_refresh_expired(self._token_leeway):
-            self._authenticate()
-        elif self._auth_state.is_access_expired(self._token_leeway):
-            self._refresh_access_token()
+        self.authenticate()
         return self._auth_state.get_access_token()
 
     @auth_required
@@ -168,11 +188,11 @@ class QPayClient(BaseClient):
         """Get invoice by Id."""
         response = self._request(
             "GET",
-            f"/invoice/{invoice_id}",
+            self._route(self._INVOICE_PATH, invoice_id),
             headers=self.headers(),
         )
 
-        data = InvoiceGetResponse.model_validate(response.json())
+        data = InvoiceGetResponse.model_validate_json(response.content)
         return data
 
     @auth_required
@@ -182,10 +202,10 @@ class QPayClient(BaseClient):
             "POST",
             "/invoice",
             headers=self.headers(),
-            json=self._invoice_create_payload(create_invoice_request),
+            content=self._invoice_create_payload(create_invoice_request),
         )
 
-        data = InvoiceCreateResponse.model_validate(response.json())
+        data = InvoiceCreateResponse.model_validate_json(response.content)
         return data
 
     @auth_required
@@ -195,7 +215,7 @@ class QPayClient(BaseClient):
     ) -> int:
         response = self._request(
             "DELETE",
-            f"/invoice/{invoice_id}",
+            self._route(self._INVOICE_PATH, invoice_id),
             headers=self.headers(),
         )
 
@@ -205,24 +225,28 @@ class QPayClient(BaseClient):
     def payment_get(self, payment_id: str) -> PaymentGetResponse:
         response = self._request(
             "GET",
-            f"/payment/{payment_id}",
+            self._route(self._PAYMENT_PATH, payment_id),
             headers=self.headers(),
         )
 
-        data = PaymentGetResponse.model_validate(response.json())
+        data = PaymentGetResponse.model_validate_json(response.content)
         return data
 
     @auth_required
-    @poll_until_paid
     def payment_check(self, payment_check_request: PaymentCheckRequest) -> PaymentCheckResponse:
         """Check payment status, polling until a payment is found or retries exhausted."""
+        # Serialize once; the body is reused for every poll attempt
+        return self._payment_check(self._serialize(payment_check_request))
+
+    @poll_until_paid
+    def _payment_check(self, body: bytes) -> PaymentCheckResponse:
         response = self._request(
             "POST",
             "/payment/check",
             headers=self.headers(),
-            json=payment_check_request.model_dump(by_alias=True, exclude_none=True, mode="json"),
+            content=body,
         )
-        return PaymentCheckResponse.model_validate(response.json())
+        return PaymentCheckResponse.model_validate_json(response.content)
 
     @auth_required
     def payment_cancel(
@@ -232,9 +256,9 @@ class QPayClient(BaseClient):
     ) -> int:
         response = self._request(
             "DELETE",
-            f"/payment/cancel/{payment_id}",
+            self._route(self._PAYMENT_CANCEL_PATH, payment_id),
             headers=self.headers(),
-            json=payment_cancel_request.model_dump(by_alias=True, exclude_none=True, mode="json"),
+            content=self._serialize(payment_cancel_request),
         )
 
         return response.status_code
@@ -247,9 +271,9 @@ class QPayClient(BaseClient):
     ) -> int:
         response = self._request(
             "DELETE",
-            f"/payment/refund/{payment_id}",
+            self._route(self._PAYMENT_REFUND_PATH, payment_id),
             headers=self.headers(),
-            json=payment_refund_request.model_dump(by_alias=True, exclude_none=True, mode="json"),
+            content=self._serialize(payment_refund_request),
         )
 
         return response.status_code
@@ -260,10 +284,10 @@ class QPayClient(BaseClient):
             "POST",
             "/payment/list",
             headers=self.headers(),
-            json=payment_list_request.model_dump(by_alias=True, exclude_none=True, mode="json"),
+            content=self._serialize(payment_list_request),
         )
 
-        data = PaymentListResponse.model_validate(response.json())
+        data = PaymentListResponse.model_validate_json(response.content)
         return data
 
     @auth_required
@@ -272,21 +296,21 @@ class QPayClient(BaseClient):
             "POST",
             "/ebarimt/create",
             headers=self.headers(),
-            json=ebarimt_create_request.model_dump(by_alias=True, exclude_none=True, mode="json"),
+            content=self._serialize(ebarimt_create_request),
         )
 
-        data = EbarimtCreateResponse.model_validate(response.json())
+        data = EbarimtCreateResponse.model_validate_json(response.content)
         return data
 
     @auth_required
     def ebarimt_get(self, barimt_id: str) -> EbarimtGetResponse:
         response = self._request(
             "GET",
-            f"/ebarimt/{barimt_id}",
+            self._route(self._EBARIMT_PATH, barimt_id),
             headers=self.headers(),
         )
 
-        data = EbarimtGetResponse.model_validate(response.json())
+        data = EbarimtGetResponse.model_validate_json(response.content)
         return data
 
     @auth_required
@@ -294,11 +318,11 @@ class QPayClient(BaseClient):
         """Send get subscription request."""
         response = self._request(
             "GET",
-            f"/subscription/{subscription_id}",
+            self._route(self._SUBSCRIPTION_PATH, subscription_id),
             headers=self.headers(),
         )
 
-        data = SubscriptionGetResponse.model_validate(response.json())
+        data = SubscriptionGetResponse.model_validate_json(response.content)
         return data
 
     @auth_required
@@ -306,7 +330,7 @@ class QPayClient(BaseClient):
         """Send cancel subscription request."""
         response = self._request(
             "DELETE",
-            f"/subscription/{subscription_id}",
+            self._route(self._SUBSCRIPTION_PATH, subscription_id),
             headers=self.headers(),
         )
 
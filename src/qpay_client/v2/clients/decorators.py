@@ -12,7 +12,8 @@ def auth_required(func: SyncMethod) -> SyncMethod:
 
     @wraps(func)
     def wrapper(self, *args: Any, **kwargs: Any):
-        self.authenticate()
+        if not self.is_authenticated:
+            self.authenticate()
         return func(self, *args, **kwargs)
 
     return wrapper  # type: ignore[return-value]
@@ -23,7 +24,9 @@ def async_auth_required(func: AsyncMethod) -> AsyncMethod:
 
     @wraps(func)
     async def wrapper(self, *args: Any, **kwargs: Any):
-        await self.authenticate()
+        # Fast path: a token outside the refresh-ahead window needs no authenticate() coroutine
+        if not self._auth_state.is_access_valid(leeway=self._refresh_ahead_leeway):
+            await self.authenticate()
         return await func(self, *args, **kwargs)
 
     return wrapper  # type: ignore[return-value]
@@ -55,6 +58,7 @@ def poll_until_paid(func: SyncMethod) -> SyncMethod:
                     self._settings.payment_check_delay,
                     attempt,
                     self._settings.payment_check_jitter,
+                    self._settings.payment_check_max_delay,
                 )
             )
             data = func(self, *args, **kwargs)
@@ -87,6 +91,7 @@ def async_poll_until_paid(func: AsyncMethod) -> AsyncMethod:
                     self._settings.payment_check_delay,
                     attempt,
                     self._settings.payment_check_jitter,
+                    self._settings.payment_check_max_delay,
                 )
             )
             data = await func(self, *args, **kwargs)
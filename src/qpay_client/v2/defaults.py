@@ -15,4 +15,5 @@ def default_timeout() -> Timeout:
 
 
 def default_limits() -> Limits:
-    return Limits(max_connections=100, max_keepalive_connections=20)
+    # Single QPay host: keep every pooled connection alive instead of churning TLS handshakes
+    return Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=60.0)
@@ -36,6 +36,12 @@ class QPaySettings:
     - ``payment_check_retries`` / ``payment_check_delay`` / ``payment_check_jitter``
       control how ``payment_check()`` polls until a payment is confirmed.
 
+    Both back off exponentially (``delay * 2 ** (attempt - 1)`` plus jitter),
+    capped at ``client_max_delay`` / ``payment_check_max_delay`` seconds.
+
+    ``http2=True`` multiplexes concurrent requests over a single connection to
+    QPay. It requires the ``h2`` package (``pip install qpay-client[http2]``).
+
     ``token_leeway`` (default 60 s) is the window before token expiry in which
     the client proactively refreshes, preventing races at the boundary.
     """
@@ -47,15 +53,18 @@ class QPaySettings:
 
     timeout: Timeout = field(default_factory=default_timeout)
     limits: Limits = field(default_factory=default_limits)
+    http2: bool = False
     log_level: Union[int, str] = logging.INFO
 
     token_leeway: float = 60.0
     client_retries: int = 5
     client_delay: float = 0.5
     client_jitter: float = 0.5
+    client_max_delay: float = 60.0
     payment_check_retries: int = 5
     payment_check_delay: float = 0.5
     payment_check_jitter: float = 0.5
+    payment_check_max_delay: float = 60.0
 
     @classmethod
     def sandbox(
@@ -11,8 +11,9 @@ from .error import NetworkError
 from .settings import QPaySettings
 from .utils import exponential_backoff, handle_error
 
-SyncRefreshHandler = Callable[[], None]
-AsyncRefreshHandler = Callable[[], Awaitable[None]]
+# A refresh handler gets the rejected Authorization header and may return replacement headers for the replay
+SyncRefreshHandler = Callable[[Optional[str]], Optional[dict[str, str]]]
+AsyncRefreshHandler = Callable[[Optional[str]], Awaitable[Optional[dict[str, str]]]]
 
 
 class SyncTransport:
@@ -24,10 +25,13 @@ class SyncTransport:
         logger: logging.Logger,
         client: Optional[Client] = None,
     ) -> None:
+        # An injected client may be shared with other QPay clients; its owner closes it
+        self._owns_client = client is None
         self._client = client or Client(
             base_url=settings.base_url,
             timeout=settings.timeout,
             limits=settings.limits,
+            http2=settings.http2,
         )
         self._settings = settings
         self._logger = logger
@@ -41,7 +45,7 @@ class SyncTransport:
         return self._client.is_closed
 
     def close(self) -> None:
-        if not self.is_closed:
+        if self._owns_client and not self.is_closed:
             self._client.close()
 
     def _sleep(self, attempt: int) -> None:
@@ -50,6 +54,7 @@ class SyncTransport:
                 self._settings.client_delay,
                 attempt,
                 self._settings.client_jitter,
+                self._settings.client_max_delay,
             )
         )
 
@@ -76,7 +81,9 @@ class SyncTransport:
 
                 if response.status_code == 401 and on_unauthorized is not None:
                     self._logger.info("401 received, refreshing access token")
-                    on_unauthorized()
+                    headers = on_unauthorized((kwargs.get("headers") or {}).get("Authorization"))
+                    if headers is not None:
+                        kwargs["headers"] = headers
                     response = self._send(method, url, **kwargs)
                     self._logger.debug("Response after refresh: %s %s", response.status_code, url)
 
@@ -130,10 +137,13 @@ class AsyncTransport:
     ) -> None:
         self._settings = settings
         self._logger = logger
+        # An injected client may be shared with other QPay clients; its owner closes it
+        self._owns_client = client is None
         self._client = client or AsyncClient(
             base_url=settings.base_url,
             timeout=settings.timeout,
             limits=settings.limits,
+            http2=settings.http2,
         )
 
     @property
@@ -149,7 +159,7 @@ class AsyncTransport:
         return self._client.is_closed
 
     async def close(self) -> None:
-        if not self.is_closed:
+        if self._owns_client and not self.is_closed:
             await self._client.aclose()
 
     async def _sleep(self, attempt: int) -> None:
@@ -158,6 +168,7 @@ class AsyncTransport:
                 self._settings.client_delay,
                 attempt,
                 self._settings.client_jitter,
+                self._settings.client_max_delay,
             )
         )
 
@@ -184,7 +195,9 @@ class AsyncTransport:
 
                 if response.status_code == 401 and on_unauthorized is not None:
                     self._logger.info("401 received, refreshing access token")
-                    await on_unauthorized()
+                    headers = await on_unauthorized((kwargs.get("headers") or {}).get("Authorization"))
+                    if headers is not None:
+                        kwargs["headers"] = headers
                     response = await self._send(method, url, **kwargs)
                     self._logger.debug("Response after refresh: %s %s", response.status_code, url)
 
@@ -1,5 +1,6 @@
 from logging import Logger
 from random import random
+from typing import NoReturn
 
 from httpx import Response
 
@@ -8,20 +9,24 @@ from .error import QPayError
 
 def safe_json(response: Response) -> dict[str, str]:
     """Avoids json error."""
+    # Gateway error pages (502/503/504) are HTML; skip the doomed decode attempt
+    if response.headers.get("content-type", "").startswith("text/html"):
+        return {"message": response.text}
     try:
         return response.json()
     except ValueError:
         return {"message": response.text}
 
 
-def handle_error(response: Response, logger: Logger):
-    """Used for handling qpay server errors."""
+def handle_error(response: Response, logger: Logger) -> NoReturn:
+    """Used for handling qpay server errors. Always raises ``QPayError``."""
     error_data = safe_json(response)
-    logger.error(f"QPayError {response.status_code} error: {error_data}")
+    logger.error("QPayError %s error: %s", response.status_code, error_data)
     raise QPayError(status_code=response.status_code, error_key=error_data.get("message", ""))
 
 
 def exponential_backoff(base_delay: float, attempt: int, jitter: float, max_delay: float = 60.0) -> float:
-    """Returns delay for retry backoff."""
-    delay = base_delay * (2 ** (attempt - 1)) + random() * jitter
+    """Returns delay for retry backoff, growing as ``base_delay * 2 ** (attempt - 1)`` up to ``max_delay``."""
+    # Cap the exponent so large attempt counts cannot overflow float conversion
+    delay = base_delay * (2 ** min(attempt - 1, 64)) + random() * jitter
     return min(delay, max_delay)
@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 
 import pytest
+import pytest_asyncio
 
 from qpay_client.v2 import AsyncQPayClient, QPayError, QPaySettings
 from qpay_client.v2.defaults import SANDBOX_INVOICE_CODE, SANDBOX_URL
@@ -19,7 +20,7 @@ from qpay_client.v2.schemas import (
 
 # --- markers and controls -----------------------------------------------------
 
-pytestmark = [pytest.mark.asyncio, pytest.mark.integration]
+pytestmark = [pytest.mark.asyncio(loop_scope="session"), pytest.mark.integration]
 
 # To avoid accidental live hits in CI, require explicit opt-in.
 RUN_LIVE = os.environ.get("QPAY_RUN_LIVE_TESTS", "0") == "1"
@@ -56,20 +57,26 @@ async def _new_client() -> AsyncQPayClient:
     return AsyncQPayClient(settings=settings)
 
 
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client():
+    # One client per session: the sandbox token and connection are reused by every test
+    cli = await _new_client()
+    yield cli
+    await cli.aclose()
+
+
 # --- tests --------------------------------------------------------------------
 
 
 @skip_live
-async def test_auth_token_obtained_from_sandbox():
-    client = await _new_client()
+async def test_auth_token_obtained_from_sandbox(client: AsyncQPayClient):
     token = await client._get_auth_token()
     assert isinstance(token, str)
     assert len(token) > 10  # a JWT-ish string
 
 
 @skip_live
-async def test_refresh_token_path_works():
-    client = await _new_client()
+async def test_refresh_token_path_works(client: AsyncQPayClient):
     # Force an authenticate to ensure we have refresh token material
     tok1 = await client._get_auth_token()
     assert tok1
@@ -86,9 +93,7 @@ async def test_refresh_token_path_works():
 
 
 @skip_live
-async def test_invoice_lifecycle_create_get_cancel_payment_check_and_list():
-    client = await _new_client()
-
+async def test_invoice_lifecycle_create_get_cancel_payment_check_and_list(client: AsyncQPayClient):
     # 1) CREATE INVOICE (per docs: invoice_code, sender_invoice_no, receiver_code, desc, amount, callback_url)
     #    Docs example at developer.qpay.mn under "Нэхэмжлэх үүсгэх". :contentReference[oaicite:1]{index=1}
     req = InvoiceCreateSimpleRequest(
@@ -142,7 +147,7 @@ async def test_invoice_lifecycle_create_get_cancel_payment_check_and_list():
 
 
 @skip_live
-async def test_payment_cancel_and_refund_fail_gracefully_for_unpaid():
+async def test_payment_cancel_and_refund_fail_gracefully_for_unpaid(client: AsyncQPayClient):
     """
     In sandbox, cancel/refund needs a PAID payment_id.
 
@@ -150,8 +155,6 @@ async def test_payment_cancel_and_refund_fail_gracefully_for_unpaid():
     and ensure client surfaces status/error per implementation.
     Docs show error payload like {"error": "PAYMENT_SETTLED", "message": "..."} for certain cases. :contentReference[oaicite:5]{index=5}
     """
-    client = await _new_client()
-
     # This "payment_id" is random and should not exist/settle in sandbox.
     bogus_payment_id = "123123"
 
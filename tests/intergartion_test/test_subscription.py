@@ -6,6 +6,7 @@ from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
 import pytest
+import pytest_asyncio
 from pydantic import ValidationError
 
 # ---- Project imports (adjust paths/namespaces to your package layout) ----
@@ -40,187 +41,186 @@ RUN_LIVE = os.environ.get("QPAY_RUN_LIVE_TESTS", "0") == "1"
 skip_live = pytest.mark.skipif(not RUN_LIVE, reason="Set QPAY_RUN_LIVE_TESTS=1 to run live QPay sandbox tests.")
 integration = pytest.mark.integration
 
+# Any QPay subscription interval: 1-99 days, weeks or months
+_INTERVAL_RE = re.compile(r"^[1-9][0-9]?[DWM]$")
+
 # -------------------------------------------------------------------------
 # Helpers / Fixtures
 # -------------------------------------------------------------------------
 
-invoice_list = [
-    InvoiceCreateSimpleRequest(
-        invoice_code="TEST_INVOICE",
-        sender_invoice_no=str(uuid.uuid4()),
-        invoice_receiver_code=str(uuid.uuid4()),
-        amount=Decimal(100),
-        callback_url="https://example.com/callback",
-        invoice_description="Some description",
-    ),
-    InvoiceCreateRequest(
-        invoice_code="TEST_INVOICE",
-        sender_invoice_no=str(uuid.uuid4()),
-        invoice_receiver_code=str(uuid.uuid4()),
-        callback_url="https://example.com/callback",
-        invoice_description="Some description",
-        lines=[
-            Line(
-                sender_product_code=str(uuid.uuid4()),
-                tax_product_code=None,
-                line_description="Food",
-                line_quantity=Decimal(1000),
-                line_unit_price=Decimal(1000),
-                note=None,
-                discounts=None,
-                surcharges=None,
-                taxes=None,
-            )
-        ],
-    ),
-    InvoiceCreateRequest(
-        invoice_code="TEST_INVOICE",
-        sender_invoice_no=str(uuid.uuid4()),
-        invoice_receiver_code=str(uuid.uuid4()),
-        sender_branch_code="BRANCH1",
-        sender_branch_data=SenderBranchData(
-            register="123456",
-            name="My salbar name",
-            email="salbar1@example.com",
-            phone="+97699119911",
-            address=Address(
-                city="Rio de Janeiro",
-                district="Favela Santa Marta",
-                street="Botafogo",
-                building="R. Nossa Fe 50-100",
-                address="Favela, City of god",
-                zipcode="22260-140",
-                longitude="-22.947616",
-                latitude="-43.194083",
-            ),
+
+@pytest.fixture(scope="session")
+def invoice_list():
+    """Invoice request variations, built once and only when a test asks for them."""
+    rio_address = Address(
+        city="Rio de Janeiro",
+        district="Favela Santa Marta",
+        street="Botafogo",
+        building="R. Nossa Fe 50-100",
+        address="Favela, City of god",
+        zipcode="22260-140",
+        longitude="-22.947616",
+        latitude="-43.194083",
+    )
+    return [
+        InvoiceCreateSimpleRequest(
+            invoice_code="TEST_INVOICE",
+            sender_invoice_no=str(uuid.uuid4()),
+            invoice_receiver_code=str(uuid.uuid4()),
+            amount=Decimal(100),
+            callback_url="https://example.com/callback",
+            invoice_description="Some description",
         ),
-        sender_staff_code="STAFF1",
-        sender_staff_data=SenderStaffData(name="Li'l Dice", email="immakillyou@example.com", phone="+5599119911"),
-        sender_terminal_code="TERMINAL1",
-        sender_terminal_data=SenderTerminalData(
-            name="FAVELA1",
+        InvoiceCreateRequest(
+            invoice_code="TEST_INVOICE",
+            sender_invoice_no=str(uuid.uuid4()),
+            invoice_receiver_code=str(uuid.uuid4()),
+            callback_url="https://example.com/callback",
+            invoice_description="Some description",
+            lines=[
+                Line(
+                    sender_product_code=str(uuid.uuid4()),
+                    tax_product_code=None,
+                    line_description="Food",
+                    line_quantity=Decimal(1000),
+                    line_unit_price=Decimal(1000),
+                    note=None,
+                    discounts=None,
+                    surcharges=None,
+                    taxes=None,
+                )
+            ],
         ),
-        invoice_receiver_data=InvoiceReceiverData(
-            register="123123123121121",
-            name="Li'l Dice",
-            email="immakillyou@example.com",
-            phone="+5599119911",
-            address=Address(
-                city="Rio de Janeiro",
-                district="Favela Santa Marta",
-                street="Botafogo",
-                building="R. Nossa Fe 50-100",
-                address="Favela, City of god",
-                zipcode="22260-140",
-                longitude="-22.947616",
-                latitude="-43.194083",
+        InvoiceCreateRequest(
+            invoice_code="TEST_INVOICE",
+            sender_invoice_no=str(uuid.uuid4()),
+            invoice_receiver_code=str(uuid.uuid4()),
+            sender_branch_code="BRANCH1",
+            sender_branch_data=SenderBranchData(
+                register="123456",
+                name="My salbar name",
+                email="salbar1@example.com",
+                phone="+97699119911",
+                address=rio_address,
+            ),
+            sender_staff_code="STAFF1",
+            sender_staff_data=SenderStaffData(name="Li'l Dice", email="immakillyou@example.com", phone="+5599119911"),
+            sender_terminal_code="TERMINAL1",
+            sender_terminal_data=SenderTerminalData(
+                name="FAVELA1",
+            ),
+            invoice_receiver_data=InvoiceReceiverData(
+                register="123123123121121",
+                name="Li'l Dice",
+                email="immakillyou@example.com",
+                phone="+5599119911",
+                address=rio_address,
             ),
+            callback_url="https://example.com/callback",
+            invoice_description="Some description",
+            note="City of God",
+            lines=[
+                Line(
+                    sender_product_code=str(uuid.uuid4()),
+                    tax_product_code=None,
+                    line_description="Food",
+                    line_quantity=Decimal(1000),
+                    line_unit_price=Decimal(1000),
+                    note=None,
+                    discounts=None,
+                    surcharges=None,
+                    taxes=None,
+                )
+            ],
         ),
-        callback_url="https://example.com/callback",
-        invoice_description="Some description",
-        note="City of God",
-        lines=[
-            Line(
-                sender_product_code=str(uuid.uuid4()),
-                tax_product_code=None,
-                line_description="Food",
-                line_quantity=Decimal(1000),
-                line_unit_price=Decimal(1000),
-                note=None,
-                discounts=None,
-                surcharges=None,
-                taxes=None,
-            )
-        ],
-    ),
-    InvoiceCreateRequest(
-        invoice_code="TEST_INVOICE",
-        sender_invoice_no=str(uuid.uuid4()),
-        invoice_receiver_code=str(uuid.uuid4()),
-        callback_url="https://example.com/callback",
-        invoice_description="Some description",
-        enable_expiry=True,
-        expiry_date=datetime(2025, 10, 31),
-        lines=[
-            Line(
-                sender_product_code=str(uuid.uuid4()),
-                tax_product_code=None,
-                line_description="Food",
-                line_quantity=Decimal(1000),
-                line_unit_price=Decimal(1000),
-                note=None,
-                discounts=None,
-                surcharges=None,
-                taxes=None,
-            )
-        ],
-    ),
-    InvoiceCreateRequest(
-        invoice_code="TEST_INVOICE",
-        sender_invoice_no=str(uuid.uuid4()),
-        invoice_receiver_code=str(uuid.uuid4()),
-        callback_url="https://example.com/callback",
-        invoice_description="Some description",
-        calculate_vat=True,
-        tax_type=TaxType.with_tax,
-        lines=[
-            Line(
-                sender_product_code=str(uuid.uuid4()),
-                tax_product_code=None,
-                line_description="Food",
-                line_quantity=Decimal(1000),
-                line_unit_price=Decimal(1000),
-                note=None,
-                discounts=None,
-                surcharges=None,
-                taxes=None,
-            )
-        ],
-    ),
-    InvoiceCreateRequest(
-        invoice_code="TEST_INVOICE",
-        sender_invoice_no=str(uuid.uuid4()),
-        invoice_receiver_code=str(uuid.uuid4()),
-        callback_url="https://example.com/callback",
-        invoice_description="Some description",
-        allow_subscribe=True,
-        subscription_interval="31D",
-        subscription_webhook="https://example.com/subscription/callback",
-        lines=[
-            Line(
-                sender_product_code=str(uuid.uuid4()),
-                tax_product_code=None,
-                line_description="Food",
-                line_quantity=Decimal(1000),
-                line_unit_price=Decimal(1000),
-                note=None,
-                discounts=None,
-                surcharges=None,
-                taxes=None,
-            )
-        ],
-    ),
-    InvoiceCreateRequest(
-        invoice_code="TEST_INVOICE",
-        sender_invoice_no=str(uuid.uuid4()),
-        invoice_receiver_code=str(uuid.uuid4()),
-        callback_url="https://example.com/callback",
-        invoice_description="Some description",
-        lines=[
-            Line(
-                sender_product_code=str(uuid.uuid4()),
-                tax_product_code=None,
-                line_description="Food",
-                line_quantity=Decimal(1000),
-                line_unit_price=Decimal(1000),
-                note=None,
-                discounts=None,
-                surcharges=None,
-                taxes=None,
-            )
-        ],
-    ),
-]
+        InvoiceCreateRequest(
+            invoice_code="TEST_INVOICE",
+            sender_invoice_no=str(uuid.uuid4()),
+            invoice_receiver_code=str(uuid.uuid4()),
+            callback_url="https://example.com/callback",
+            invoice_description="Some description",
+            enable_expiry=True,
+            expiry_date=datetime(2025, 10, 31),
+            lines=[
+                Line(
+                    sender_product_code=str(uuid.uuid4()),
+                    tax_product_code=None,
+                    line_description="Food",
+                    line_quantity=Decimal(1000),
+                    line_unit_price=Decimal(1000),
+                    note=None,
+                    discounts=None,
+                    surcharges=None,
+                    taxes=None,
+                )
+            ],
+        ),
+        InvoiceCreateRequest(
+            invoice_code="TEST_INVOICE",
+            sender_invoice_no=str(uuid.uuid4()),
+            invoice_receiver_code=str(uuid.uuid4()),
+            callback_url="https://example.com/callback",
+            invoice_description="Some description",
+            calculate_vat=True,
+            tax_type=TaxType.with_tax,
+            lines=[
+                Line(
+                    sender_product_code=str(uuid.uuid4()),
+                    tax_product_code=None,
+                    line_description="Food",
+                    line_quantity=Decimal(1000),
+                    line_unit_price=Decimal(1000),
+                    note=None,
+                    discounts=None,
+                    surcharges=None,
+                    taxes=None,
+                )
+            ],
+        ),
+        InvoiceCreateRequest(
+            invoice_code="TEST_INVOICE",
+            sender_invoice_no=str(uuid.uuid4()),
+            invoice_receiver_code=str(uuid.uuid4()),
+            callback_url="https://example.com/callback",
+            invoice_description="Some description",
+            allow_subscribe=True,
+            subscription_interval="31D",
+            subscription_webhook="https://example.com/subscription/callback",
+            lines=[
+                Line(
+                    sender_product_code=str(uuid.uuid4()),
+                    tax_product_code=None,
+                    line_description="Food",
+                    line_quantity=Decimal(1000),
+                    line_unit_price=Decimal(1000),
+                    note=None,
+                    discounts=None,
+                    surcharges=None,
+                    taxes=None,
+                )
+            ],
+        ),
+        InvoiceCreateRequest(
+            invoice_code="TEST_INVOICE",
+            sender_invoice_no=str(uuid.uuid4()),
+            invoice_receiver_code=str(uuid.uuid4()),
+            callback_url="https://example.com/callback",
+            invoice_description="Some description",
+            lines=[
+                Line(
+                    sender_product_code=str(uuid.uuid4()),
+                    tax_product_code=None,
+                    line_description="Food",
+                    line_quantity=Decimal(1000),
+                    line_unit_price=Decimal(1000),
+                    note=None,
+                    discounts=None,
+                    surcharges=None,
+                    taxes=None,
+                )
+            ],
+        ),
+    ]
 
 
 async def _new_client() -> AsyncQPayClient:
@@ -241,10 +241,12 @@ def _unique_suffix() -> str:
     return uuid.uuid4().hex[:12]
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def client():
+    # One client per session: the sandbox token is fetched once and reused by every test
     cli = await _new_client()
-    return cli
+    yield cli
+    await cli.aclose()
 
 
 def _basic_lines():
@@ -267,15 +269,17 @@ def _valid_subscription_payload(
     amount: Decimal = Decimal("1000"),
     interval: SubscriptionIntervalType = "1M",
     webhook: HttpUrlStr = "https://example.com/qpay/subscription",
+    **overrides,
 ):
     """
     Builds a valid InvoiceCreateRequest dict for subscription invoice.
 
+    Any extra keyword arguments replace the matching fields in the payload.
     Adjust fields to match your exact Pydantic model names.
     """
     uid = _unique_suffix()
     due = datetime.now(timezone.utc) + timedelta(days=2)
-    return dict(
+    payload = dict(
         invoice_code="TEST_INVOICE",
         sender_invoice_no=f"SUB-{uid}",
         invoice_receiver_code=f"CUST-{uid}",
@@ -294,6 +298,8 @@ def _valid_subscription_payload(
         # If you have tax_type and it must be 1|2|3, set one:
         # tax_type="1",
     )
+    payload.update(overrides)
+    return payload
 
 
 # -------------------------------------------------------------------------
@@ -304,30 +310,15 @@ def _valid_subscription_payload(
 def test_subscription_requires_interval_and_webhook_and_lines():
     # allow_subscribe=True but missing interval
     with pytest.raises(ValueError, match=r"subscription_interval.*must have valid values"):
-        InvoiceCreateRequest(
-            **{
-                **_valid_subscription_payload(),
-                "subscription_interval": None,
-            }
-        )
+        InvoiceCreateRequest(**_valid_subscription_payload(subscription_interval=None))
 
     # allow_subscribe=True but missing webhook
     with pytest.raises(ValueError, match=r"subscription_interval and subscription_webhook must have valid values"):
-        InvoiceCreateRequest(
-            **{
-                **_valid_subscription_payload(),
-                "subscription_webhook": None,
-            }
-        )
+        InvoiceCreateRequest(**_valid_subscription_payload(subscription_webhook=None))
 
     # allow_subscribe=True but missing lines
     with pytest.raises(ValueError, match=r"lines must have atleast one value"):
-        InvoiceCreateRequest(
-            **{
-                **_valid_subscription_payload(),
-                "lines": [],
-            }
-        )
+        InvoiceCreateRequest(**_valid_subscription_payload(lines=[]))
 
 
 def test_invalid_subscription_interval_pattern_rejected_by_type():
@@ -356,10 +347,9 @@ def test_allow_subscribe_false_does_not_require_subscription_fields():
 
 @integration
 @skip_live
-@pytest.mark.asyncio
-async def test_create_subscription_invoice_success():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_create_subscription_invoice_success(client):
     """Happy-path: create a subscription invoice and assert the subscription object,deeplinks, and essentials exist in the response."""
-    client = await _new_client()
     req = InvoiceCreateRequest(**_valid_subscription_payload())  # type: ignore
     resp: InvoiceCreateResponse = await client.invoice_create(req)
 
@@ -379,7 +369,7 @@ async def test_create_subscription_invoice_success():
     assert isinstance(sub.id, str) and sub.id
     assert isinstance(sub.g_invoice_id, str) and sub.g_invoice_id
     assert str(sub.webhook) == "https://example.com/qpay/subscription"
-    assert sub.interval in ("1M", "1W", "1D", "2W", "3M") or re.match(r"^[1-9][0-9]?[DWM]$", str(sub.interval))
+    assert sub.interval in ("1M", "1W", "1D", "2W", "3M") or _INTERVAL_RE.match(str(sub.interval))
     # Dates are reasonable
     assert isinstance(sub.start_date, datetime)
     assert isinstance(sub.created_date, datetime)
@@ -396,10 +386,9 @@ async def test_create_subscription_invoice_success():
 
 @integration
 @skip_live
-@pytest.mark.asyncio
-async def test_create_subscription_invoice_with_custom_amount_and_weekly_interval():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_create_subscription_invoice_with_custom_amount_and_weekly_interval(client):
     """Variation: different amount and interval (weekly)."""
-    client = await _new_client()
     req = InvoiceCreateRequest(
         **_valid_subscription_payload(
             amount=Decimal("2999"),
@@ -415,14 +404,13 @@ async def test_create_subscription_invoice_with_custom_amount_and_weekly_interva
 
 @integration
 @skip_live
-@pytest.mark.asyncio
-async def test_create_subscription_invoice_rejects_missing_lines_server_side():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_create_subscription_invoice_rejects_missing_lines_server_side(client):
     """
     Sanity check: if client-side validator is bypassed (e.g., building dict then model_dump),server should still reject malformed requests (defense-in-depth).
 
     We intentionally disable the lines field AFTER model creation to simulate a malformed payload.
     """
-    client = await _new_client()
     # Build a valid model
     good = InvoiceCreateRequest(**_valid_subscription_payload())  # type: ignore
 
@@ -441,10 +429,9 @@ async def test_create_subscription_invoice_rejects_missing_lines_server_side():
 
 @integration
 @skip_live
-@pytest.mark.asyncio
-async def test_create_normal_invoice_when_allow_subscribe_false():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_create_normal_invoice_when_allow_subscribe_false(client: AsyncQPayClient):
     """Ensure a non-subscription invoice does not include subscription object."""
-    client: AsyncQPayClient = await _new_client()
     payload = _valid_subscription_payload()
     payload["allow_subscribe"] = False
     payload.pop("subscription_interval", None)
@@ -1,7 +1,7 @@
 import os
 import time
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
 import pytest
@@ -51,15 +51,21 @@ def _client() -> QPayClient:
     return QPayClient(settings=settings)
 
 
+@pytest.fixture(scope="session")
+def client():
+    # One client per session: the sandbox token and connection are reused by every test
+    with _client() as c:
+        yield c
+
+
 # -------------------------------------------------------------------
 # Auth / token
 # -------------------------------------------------------------------
 
 
 @skip_live
-def test_auth_token_obtained_from_sandbox_live():
-    c = _client()
-    token = c.get_token()
+def test_auth_token_obtained_from_sandbox_live(client: QPayClient):
+    token = client.get_token()
     assert isinstance(token, str) and len(token) > 10  # JWT-like string
 
 
@@ -69,9 +75,7 @@ def test_auth_token_obtained_from_sandbox_live():
 
 
 @skip_live
-def test_invoice_create_get_cancel_live():
-    c = _client()
-
+def test_invoice_create_get_cancel_live(client: QPayClient):
     req = InvoiceCreateSimpleRequest(
         invoice_code=SANDBOX_INVOICE_CODE,
         sender_invoice_no=_unique_sender_invoice_no(),
@@ -80,17 +84,17 @@ def test_invoice_create_get_cancel_live():
         amount=Decimal("100"),  # MNT
         callback_url="https://example.com/callback",
     )
-    created = c.invoice_create(req)
+    created = client.invoice_create(req)
     assert created.invoice_id and isinstance(created.invoice_id, str)
 
     invoice_id = created.invoice_id
 
-    got = c.invoice_get(invoice_id)
+    got = client.invoice_get(invoice_id)
     assert got.invoice_id == invoice_id
     assert got.invoice_description
 
     # Cancel the invoice (unpaid → cancel should work)
-    status = c.invoice_cancel(invoice_id)
+    status = client.invoice_cancel(invoice_id)
     # Sandbox sometimes varies codes; accept 2xx
     assert status in (200, 202, 204)
 
@@ -101,11 +105,9 @@ def test_invoice_create_get_cancel_live():
 
 
 @skip_live
-def test_payment_check_and_list_live():
-    c = _client()
-
+def test_payment_check_and_list_live(client: QPayClient):
     # Create an invoice to have a fresh invoice_id for payment_check
-    created = c.invoice_create(
+    created = client.invoice_create(
         InvoiceCreateSimpleRequest(
             invoice_code=SANDBOX_INVOICE_CODE,
             sender_invoice_no=_unique_sender_invoice_no(),
@@ -118,7 +120,7 @@ def test_payment_check_and_list_live():
     invoice_id = created.invoice_id
 
     # payment_check expects object_type=INVOICE and object_id=<invoice_id>
-    check = c.payment_check(
+    check = client.payment_check(
         PaymentCheckRequest(
             object_type=ObjectType.invoice,
             object_id=invoice_id,
@@ -129,12 +131,13 @@ def test_payment_check_and_list_live():
     assert check.count >= 0
 
     # payment_list expects object_type=INVOICE and object_id=<invoice_code>
-    listed = c.payment_list(
+    now = datetime.now(timezone.utc)
+    listed = client.payment_list(
         PaymentListRequest(
             object_type=ObjectType.invoice,
             object_id=SANDBOX_INVOICE_CODE,
-            start_date=datetime.utcnow() - timedelta(days=7),
-            end_date=datetime.utcnow(),
+            start_date=now - timedelta(days=7),
+            end_date=now,
             offset=Offset(page_number=1, page_limit=20),
         )
     )
@@ -148,17 +151,16 @@ def test_payment_check_and_list_live():
 
 
 @skip_live
-def test_payment_cancel_and_refund_raise_for_invalid_payment_id_live():
-    c = _client()
+def test_payment_cancel_and_refund_raise_for_invalid_payment_id_live(client: QPayClient):
     bogus_payment_id = "00000000-0000-0000-0000-000000000000"
 
     with pytest.raises(QPayError):
-        _ = c.payment_cancel(
+        _ = client.payment_cancel(
             bogus_payment_id, PaymentCancelRequest(callback_url="https://example.com/callmesaul", note="demo")
         )
 
     with pytest.raises(QPayError):
-        _ = c.payment_refund(
+        _ = client.payment_refund(
             bogus_payment_id, payment_refund_request=PaymentRefundRequest()
         )  # body is optional in your schema
 
@@ -1,12 +1,20 @@
+import asyncio
+import json
+import re
+from dataclasses import replace
+from datetime import datetime
+
+import httpx
 import pytest
 import respx
-from httpx import Response
+from httpx import Limits, Response
 
 # Import your client + settings from your package
 # Adjust the import path to match your project layout
 from qpay_client.v2.clients.async_client import AsyncQPayClient
 from qpay_client.v2.enums import EbarimtReceiverType, InvoiceStatus, ObjectType
-from qpay_client.v2.schemas import InvoiceCreateSimpleRequest, Offset
+from qpay_client.v2.error import NetworkError, QPayError
+from qpay_client.v2.schemas import InvoiceCreateSimpleRequest, Offset, PaymentCheckRequest, PaymentListRequest
 from qpay_client.v2.settings import QPaySettings
 
 
@@ -27,6 +35,9 @@ class FakeAuthState:
     def is_access_expired(self, leeway: float = 0) -> bool:
         return self._access_expired
 
+    def is_access_valid(self, leeway: float = 0) -> bool:
+        return self.has_access_token() and not self._access_expired
+
     def is_refresh_expired(self, leeway: float = 0) -> bool:
         return self._refresh_expired
 
@@ -36,6 +47,9 @@ class FakeAuthState:
     def refresh_as_header(self) -> str:
         return f"Bearer {self._refresh}"
 
+    def invalidate_access(self) -> None:
+        self._access_expired = True
+
     def update(self, token_response):
         # token_response is a pydantic model; we just read fields by name
         # Adjust attribute names if your TokenResponse differs
@@ -410,10 +424,85 @@ async def test_401_triggers_refresh_and_replays_request(client, settings, monkey
 
     data = await client.invoice_get("a0b9f668-8a83-41e5-bbaf-3109e6aac600")
     assert route.call_count == 2
-    assert client.token == "tok_initial"
+    assert client.token == "tok_NEW"
+    assert route.calls[0].request.headers["Authorization"] == "Bearer tok_initial"
+    assert route.calls[1].request.headers["Authorization"] == "Bearer tok_NEW"
     assert data.invoice_id == "a0b9f668-8a83-41e5-bbaf-3109e6aac600"
 
 
+@pytest.mark.asyncio
+@respx.mock
+async def test_staggered_401s_refresh_token_once(client, settings, monkeypatch):
+    client._auth_state._access_expired = False
+
+    def cancel(request):
+        stale = request.headers["Authorization"] == "Bearer tok_initial"
+        return Response(401 if stale else 200, json={"detail": "expired"} if stale else {})
+
+    route = respx.delete(url__regex=rf"{settings.base_url}/invoice/INV\d").mock(side_effect=cancel)
+    refresh = respx.post(f"{settings.base_url}/auth/refresh").mock(
+        return_value=Response(
+            200,
+            json={
+                "access_token": "tok_NEW",
+                "refresh_token": "ref_AAA",
+                "expires_in": 3600,
+                "refresh_expires_in": 7200,
+                "token_type": "Bearer",
+                "scope": "session",
+                "not-before-policy": "1",
+                "session_state": "1",
+            },
+        )
+    )
+
+    # All five go out with the old token, but their 401s arrive after the first one refreshed it
+    send = client._transport._send
+    delays = iter([0.0, 0.01, 0.02, 0.03, 0.04])
+
+    async def staggered_send(method, url, **kwargs):
+        response = await send(method, url, **kwargs)
+        if response.status_code == 401:
+            await asyncio.sleep(next(delays))
+        return response
+
+    monkeypatch.setattr(client._transport, "_send", staggered_send)
+
+    results = await asyncio.gather(*(client.invoice_cancel(f"INV{i}") for i in range(5)))
+
+    assert results == [200] * 5
+    assert refresh.call_count == 1
+    assert route.call_count == 10
+    assert client.token == "tok_NEW"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_rejected_credentials_raise_without_relogin_loop(settings):
+    client = AsyncQPayClient(settings=replace(settings, client_retries=0))
+    route = respx.post(f"{settings.base_url}/auth/token").mock(
+        return_value=Response(401, json={"message": "AUTHENTICATION_FAILED"})
+    )
+
+    with pytest.raises(QPayError):
+        await client.authenticate()
+    assert route.call_count == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_refresh_network_error_is_retried_and_wrapped(settings, monkeypatch):
+    client = AsyncQPayClient(settings=replace(settings, client_retries=2))
+    monkeypatch.setattr(client, "_auth_state", FakeAuthState())  # expired access, valid refresh
+    route = respx.post(f"{settings.base_url}/auth/refresh").mock(side_effect=httpx.ConnectError("boom"))
+
+    with pytest.raises(NetworkError):
+        await client.authenticate()
+    assert route.call_count == 3
+    await client.close()
+
+
 @pytest.mark.asyncio
 @respx.mock
 async def test_payment_check_polls_until_count_gt_zero(client, settings):
@@ -581,3 +670,354 @@ async def test_ebarimt_create_parses_response(client, settings):
     eb = await client.ebarimt_create(req)
 
     assert eb.id == "b5e2a8fa-dc71-42e4-95de-7d57a39a5b3e"
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_underlying_client(client):
+    assert client.is_closed is False
+    await client.aclose()
+    assert client.is_closed is True
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_concurrent_authenticate_shares_one_token_fetch(client, settings):
+    route = respx.post(f"{settings.base_url}/auth/refresh").mock(
+        return_value=Response(
+            200,
+            json={
+                "access_token": "tok_ONE",
+                "refresh_token": "ref_AAA",
+                "expires_in": 3600,
+                "refresh_expires_in": 7200,
+                "token_type": "Bearer",
+                "scope": "session",
+                "not-before-policy": "1",
+                "session_state": "1",
+            },
+        )
+    )
+
+    await asyncio.gather(*(client.authenticate() for _ in range(10)))
+
+    assert route.call_count == 1
+    assert client.token == "tok_ONE"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_aging_token_is_refreshed_in_background(settings, monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr("time.time", lambda: now)
+
+    client = AsyncQPayClient(settings=settings)
+    client._auth_state.access_token = "tok_OLD"
+    # Valid under the 60 s leeway, but inside the 120 s refresh-ahead window
+    client._auth_state.access_token_expiry_at = now + 90
+    client._auth_state.refresh_token = "ref_AAA"
+    client._auth_state.refresh_token_expiry_at = now + 7200
+
+    route = respx.post(f"{settings.base_url}/auth/refresh").mock(
+        return_value=Response(
+            200,
+            json={
+                "access_token": "tok_NEW",
+                "refresh_token": "ref_AAA",
+                "expires_in": now + 3600,
+                "refresh_expires_in": now + 7200,
+                "token_type": "bearer",
+                "scope": "session",
+                "not-before-policy": "1",
+                "session_state": "1",
+            },
+        )
+    )
+
+    await client.authenticate()
+    # Caller is not blocked: the old token is still in use
+    assert client.token == "tok_OLD"
+
+    await client._auth_inflight
+    assert route.call_count == 1
+    assert client.token == "tok_NEW"
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_failed_background_refresh_backs_off(settings, monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr("time.time", lambda: now)
+
+    client = AsyncQPayClient(settings=replace(settings, client_retries=0))
+    client._auth_state.access_token = "tok_OLD"
+    client._auth_state.access_token_expiry_at = now + 90  # inside the refresh-ahead window
+    client._auth_state.refresh_token = "ref_AAA"
+    client._auth_state.refresh_token_expiry_at = now + 7200
+
+    route = respx.post(f"{settings.base_url}/auth/refresh").mock(return_value=Response(503))
+
+    await client.authenticate()
+    with pytest.raises(QPayError):
+        await client._auth_inflight
+
+    # Within the cooldown later calls keep the old token without another refresh
+    for _ in range(5):
+        await client.authenticate()
+    assert route.call_count == 1
+    assert client.token == "tok_OLD"
+
+    client._refresh_ahead_retry_at = 0.0  # cooldown over
+    await client.authenticate()
+    with pytest.raises(QPayError):
+        await client._auth_inflight
+    assert route.call_count == 2
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_fresh_token_skips_authenticate(client, settings, monkeypatch):
+    client._auth_state._access_expired = False
+    calls = {"authenticate": 0}
+
+    async def counting_authenticate():
+        calls["authenticate"] += 1
+
+    monkeypatch.setattr(client, "authenticate", counting_authenticate)
+    respx.delete(f"{settings.base_url}/invoice/INV1").mock(return_value=Response(200))
+
+    assert await client.invoice_cancel("INV1") == 200
+    assert calls["authenticate"] == 0
+
+
+def _payment_get_payload(payment_id: str) -> dict:
+    return {
+        "payment_id": payment_id,
+        "payment_status": "PAID",
+        "payment_fee": "0.00",
+        "payment_amount": "120.00",
+        "payment_currency": "MNT",
+        "payment_date": "2025-03-10T07:45:20.214Z",
+        "payment_wallet": "0fc9b71c-cd87-4ffd-9cac-2279ebd9deb0",
+        "object_type": "INVOICE",
+        "object_id": "893e1017-f8b5-4bf3-9178-010f847dceee",
+        "transaction_type": "P2P",
+        "card_transactions": [],
+        "p2p_transactions": [],
+    }
+
+
+def _invoice_get_payload(invoice_id: str) -> dict:
+    return {
+        "invoice_id": invoice_id,
+        "invoice_status": "OPEN",
+        "sender_invoice_no": "123456",
+        "invoice_description": "desc",
+        "total_amount": "100.00",
+        "gross_amount": "100.00",
+        "tax_amount": "0.00",
+        "surcharge_amount": "0.00",
+        "discount_amount": "0.00",
+        "callback_url": "https://example.com/callback",
+        "lines": [],
+        "transactions": [],
+        "inputs": [],
+    }
+
+
+def _last_segment(request) -> str:
+    return request.url.path.rsplit("/", 1)[-1]
+
+
+def _object_id(request) -> int:
+    return int(json.loads(request.content)["object_id"])
+
+
+# batch helper -> (HTTP method, path regex, response body for a request, argument for a key, key of a result).
+# Every response echoes the key it was asked for, so the result order is observable.
+_MANY_CASES = {
+    "invoice_create_many": (
+        "POST",
+        "/invoice",
+        lambda request: {
+            "invoice_id": json.loads(request.content)["sender_invoice_no"],
+            "qr_text": "QR",
+            "qr_image": "img",
+            "qPay_shortUrl": "u",
+            "urls": [],
+        },
+        lambda key: InvoiceCreateSimpleRequest(
+            sender_invoice_no=key,
+            invoice_receiver_code="terminal",
+            invoice_description="desc",
+            amount="100.00",
+            callback_url="https://example.com/callback",
+        ),
+        lambda result: result.invoice_id,
+    ),
+    "invoice_get_many": (
+        "GET",
+        r"/invoice/\d+",
+        lambda request: _invoice_get_payload(_last_segment(request)),
+        lambda key: key,
+        lambda result: result.invoice_id,
+    ),
+    "payment_check_many": (
+        "POST",
+        "/payment/check",
+        lambda request: {"count": _object_id(request), "paid_amount": 1, "rows": []},
+        lambda key: PaymentCheckRequest(
+            object_type=ObjectType.invoice, object_id=key, offset=Offset(page_limit=100, page_number=1)
+        ),
+        lambda result: str(result.count),
+    ),
+    "payment_get_many": (
+        "GET",
+        r"/payment/\d+",
+        lambda request: _payment_get_payload(_last_segment(request)),
+        lambda key: key,
+        lambda result: result.payment_id,
+    ),
+    "payment_list_many": (
+        "POST",
+        "/payment/list",
+        lambda request: {"count": _object_id(request), "rows": []},
+        lambda key: PaymentListRequest(
+            object_type=ObjectType.invoice,
+            object_id=key,
+            start_date=datetime(2025, 1, 1),
+            end_date=datetime(2025, 1, 31),
+            offset=Offset(page_number=1, page_limit=10),
+        ),
+        lambda result: str(result.count),
+    ),
+}
+
+
+@pytest.mark.parametrize("batch", list(_MANY_CASES))
+@pytest.mark.asyncio
+@respx.mock
+async def test_many_returns_results_in_input_order(client, settings, batch):
+    method, path, respond, make_arg, read_key = _MANY_CASES[batch]
+    client._auth_state._access_expired = False
+    respx.route(method=method, url__regex=re.escape(settings.base_url) + path + "$").mock(
+        side_effect=lambda request: Response(200, json=respond(request))
+    )
+
+    results = await getattr(client, batch)([make_arg(key) for key in ("3", "1", "2")], limit=2)
+
+    assert [read_key(result) for result in results] == ["3", "1", "2"]
+
+
+def _track_concurrency(monkeypatch, client, method, fail_on=None):
+    """Replace ``client.<method>`` with a fake that records how many calls overlap."""
+    stats = {"created": 0, "started": 0, "running": 0, "peak": 0, "cancelled": 0}
+
+    def fake(arg):
+        stats["created"] += 1
+        return run(arg)
+
+    async def run(arg):
+        stats["started"] += 1
+        stats["running"] += 1
+        stats["peak"] = max(stats["peak"], stats["running"])
+        try:
+            if arg == fail_on:
+                raise RuntimeError("boom")
+            await asyncio.sleep(0.01 if fail_on is None else 1)
+            return arg
+        except asyncio.CancelledError:
+            stats["cancelled"] += 1
+            raise
+        finally:
+            stats["running"] -= 1
+
+    monkeypatch.setattr(client, method, fake)
+    return stats
+
+
+@pytest.mark.asyncio
+async def test_many_defaults_to_pool_size(settings, monkeypatch):
+    client = AsyncQPayClient(settings=replace(settings, limits=Limits(max_connections=2)))
+    stats = _track_concurrency(monkeypatch, client, "payment_get")
+
+    assert await client.payment_get_many(["P1", "P2", "P3", "P4", "P5"]) == ["P1", "P2", "P3", "P4", "P5"]
+    assert stats["peak"] == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_many_with_unlimited_pool_is_not_serialized(settings, monkeypatch):
+    client = AsyncQPayClient(settings=replace(settings, limits=Limits(max_connections=None)))
+    stats = _track_concurrency(monkeypatch, client, "payment_get")
+
+    await client.payment_get_many(["P1", "P2", "P3", "P4", "P5"])
+
+    assert stats["peak"] == 5
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_many_with_injected_client_is_not_capped_by_settings(settings, monkeypatch):
+    http = httpx.AsyncClient(base_url=settings.base_url, limits=Limits(max_connections=10))
+    client = AsyncQPayClient(settings=replace(settings, limits=Limits(max_connections=2)), client=http)
+    stats = _track_concurrency(monkeypatch, client, "payment_get")
+
+    await client.payment_get_many(["P1", "P2", "P3", "P4", "P5"])
+
+    assert stats["peak"] == 5
+    await http.aclose()
+
+
+@pytest.mark.asyncio
+async def test_many_failure_cancels_remaining_calls(client, monkeypatch):
+    stats = _track_concurrency(monkeypatch, client, "payment_check", fail_on="P2")
+
+    with pytest.raises(RuntimeError):
+        await client.payment_check_many(["P1", "P2", "P3"], limit=5)
+
+    assert stats["cancelled"] == 2
+    assert stats["running"] == 0
+
+
+@pytest.mark.parametrize(
+    "batch, single",
+    [
+        ("invoice_create_many", "invoice_create"),
+        ("invoice_get_many", "invoice_get"),
+        ("payment_check_many", "payment_check"),
+        ("payment_get_many", "payment_get"),
+        ("payment_list_many", "payment_list"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_many_respects_limit(client, monkeypatch, batch, single):
+    stats = _track_concurrency(monkeypatch, client, single)
+
+    results = await getattr(client, batch)(["A", "B", "C", "D", "E"], limit=2)
+
+    assert results == ["A", "B", "C", "D", "E"]
+    assert stats["peak"] == 2
+
+
+@pytest.mark.filterwarnings("error::RuntimeWarning")
+@pytest.mark.asyncio
+async def test_many_failure_leaves_no_queued_call_unawaited(client, monkeypatch):
+    stats = _track_concurrency(monkeypatch, client, "payment_get", fail_on="P1")
+
+    with pytest.raises(RuntimeError):
+        await client.payment_get_many(["P1", "P2", "P3", "P4"], limit=1)
+
+    # Queued calls are only created once a slot frees up, so none is left never awaited
+    assert stats["created"] == stats["started"] < 4
+    assert stats["peak"] == 1
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+@pytest.mark.asyncio
+async def test_many_rejects_limit_below_one(client, limit):
+    with pytest.raises(ValueError, match="limit must be at least 1"):
+        await client.payment_get_many(["P1", "P2"], limit=limit)
@@ -1,6 +1,7 @@
+import httpx
 import pytest
 
-from qpay_client.v2.auth import QpayAuthState, _normalize_to_capital
+from qpay_client.v2.auth import QpayAuthState, _normalize_to_capital, basic_auth_header
 from qpay_client.v2.error import AuthError
 from qpay_client.v2.schemas import TokenResponse
 
@@ -82,3 +83,21 @@ def test_update_populates_fields_from_token_response():
     assert state.scope == "read write"
     assert state.not_before_policy == "0"
     assert state.session_state == "sess123"
+
+
+def test_is_access_valid_requires_token_and_unexpired(monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr("time.time", lambda: now)
+
+    state = QpayAuthState(access_token_expiry_at=now + 120)
+    assert state.is_access_valid() is False  # no token yet
+
+    state.access_token = "a1"
+    assert state.is_access_valid() is True
+    assert state.is_access_valid(leeway=130) is False
+
+
+def test_basic_auth_header_matches_httpx_encoding():
+    request = httpx.Request("POST", "https://example.com")
+    expected = next(httpx.BasicAuth("TEST_MERCHANT", "123456").auth_flow(request)).headers["Authorization"]
+    assert basic_auth_header("TEST_MERCHANT", "123456") == expected
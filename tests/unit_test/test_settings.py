@@ -12,12 +12,15 @@ def test_sandbox_settings_use_expected_defaults():
     assert settings.invoice_code == SANDBOX_INVOICE_CODE
     assert settings.base_url == SANDBOX_URL
     assert settings.token_leeway == 60.0
+    assert settings.http2 is False
     assert settings.client_retries == 5
     assert settings.client_delay == 0.5
     assert settings.client_jitter == 0.5
+    assert settings.client_max_delay == 60.0
     assert settings.payment_check_retries == 5
     assert settings.payment_check_delay == 0.5
     assert settings.payment_check_jitter == 0.5
+    assert settings.payment_check_max_delay == 60.0
 
 
 def test_sandbox_settings_allow_overrides():
@@ -71,4 +74,4 @@ def test_settings_create_fresh_httpx_defaults_per_instance():
     assert first.timeout is not second.timeout
     assert first.limits is not second.limits
     assert first.timeout == Timeout(connect=5.0, read=10.0, write=10.0, pool=5.0)
-    assert first.limits == Limits(max_connections=100, max_keepalive_connections=20)
+    assert first.limits == Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=60.0)
@@ -1,4 +1,9 @@
 # tests/unit_test/test_sync.py
+import json
+import threading
+import time
+
+import httpx
 import pytest
 import respx
 from httpx import Response
@@ -6,6 +11,7 @@ from httpx import Response
 # Adjust these imports to your real package paths
 from qpay_client.v2 import QPayClient, QPaySettings
 from qpay_client.v2.enums import EbarimtReceiverType, InvoiceStatus, ObjectType
+from qpay_client.v2.error import NetworkError, QPayError
 from qpay_client.v2.schemas import InvoiceCreateSimpleRequest, Offset
 
 
@@ -25,6 +31,9 @@ class FakeAuthState:
     def is_access_expired(self, leeway: float = 0) -> bool:
         return self._access_expired
 
+    def is_access_valid(self, leeway: float = 0) -> bool:
+        return self.has_access_token() and not self._access_expired
+
     def is_refresh_expired(self, leeway: float = 0) -> bool:
         return self._refresh_expired
 
@@ -34,6 +43,9 @@ class FakeAuthState:
     def refresh_as_header(self) -> str:
         return f"Bearer {self._refresh}"
 
+    def invalidate_access(self) -> None:
+        self._access_expired = True
+
     def update(self, token_response):
         self._access = token_response.access_token
         self._refresh = token_response.refresh_token
@@ -144,6 +156,42 @@ def test_headers_include_bearer_token_after_auth(client, settings):
     assert auth == "Bearer tok_AAA"
 
 
+@respx.mock
+def test_headers_are_cached_until_token_changes(client, settings):
+    wire_auth(settings)
+    client.authenticate()
+
+    first = client.headers()
+    assert client.headers() is first
+    assert first["Authorization"] == "Bearer tok_AAA"
+
+    client._auth_state._access = "tok_BBB"
+    second = client.headers()
+    assert second is not first
+    assert second["Authorization"] == "Bearer tok_BBB"
+
+
+@respx.mock
+def test_path_params_are_percent_encoded(client, settings):
+    wire_auth(settings)
+
+    route = respx.delete(f"{settings.base_url}/invoice/a%2Fb").mock(return_value=Response(200))
+
+    assert client.invoice_cancel("a/b") == 200
+    assert route.called
+    assert route.calls.last.request.url.raw_path == b"/v2/invoice/a%2Fb"
+
+
+@respx.mock
+def test_numeric_path_params_are_accepted(client, settings):
+    wire_auth(settings)
+
+    route = respx.delete(f"{settings.base_url}/invoice/912213777662363").mock(return_value=Response(200))
+
+    assert client.invoice_cancel(912213777662363) == 200
+    assert route.called
+
+
 @respx.mock
 def test_invoice_create_defaults_invoice_code_from_settings(client, settings):
     wire_auth(settings)
@@ -176,6 +224,46 @@ def test_invoice_create_defaults_invoice_code_from_settings(client, settings):
     assert route.calls.last.request.read().decode().find(settings.invoice_code) >= 0
 
 
+@respx.mock
+def test_invoice_create_sends_serialized_body(client, settings):
+    wire_auth(settings)
+
+    route = respx.post(f"{settings.base_url}/invoice").mock(
+        return_value=Response(
+            200,
+            json={
+                "invoice_id": "INV-UUID",
+                "qr_text": "QRDATA",
+                "qr_image": "data:image/png;base64,xxx",
+                "qPay_shortUrl": "https://qpay.mn/s/abc",
+                "urls": [],
+            },
+        )
+    )
+
+    client.invoice_create(
+        InvoiceCreateSimpleRequest(
+            invoice_code="OWN_CODE",
+            sender_invoice_no="INV-NEW",
+            invoice_receiver_code="terminal",
+            invoice_description="desc",
+            amount="100.00",
+            callback_url="https://example.com/callback",
+        )
+    )
+
+    request = route.calls.last.request
+    assert request.headers["Content-Type"] == "application/json"
+    assert json.loads(request.content) == {
+        "invoice_code": "OWN_CODE",
+        "sender_invoice_no": "INV-NEW",
+        "invoice_receiver_code": "terminal",
+        "invoice_description": "desc",
+        "amount": "100.00",
+        "callback_url": "https://example.com/callback",
+    }
+
+
 @respx.mock
 def test_request_retries_on_500_then_succeeds(client, settings):
     wire_auth(settings)
@@ -296,10 +384,144 @@ def test_401_triggers_refresh_and_replays_request(client, settings):
     data = client.invoice_get("a0b9f668-8a83-41e5-bbaf-3109e6aac600")
     assert route.call_count == 2
     # After 401, /auth/refresh was called and token updated to tok_AAA by wire_auth
-    assert client.token == "tok_initial"
+    assert client.token == "tok_AAA"
+    assert route.calls[0].request.headers["Authorization"] == "Bearer tok_initial"
+    assert route.calls[1].request.headers["Authorization"] == "Bearer tok_AAA"
     assert data.invoice_id == "a0b9f668-8a83-41e5-bbaf-3109e6aac600"
 
 
+@respx.mock
+def test_rejected_credentials_raise_without_relogin_loop(client, settings):
+    client._auth_state._access = None  # no token yet, so authenticate() logs in
+    route = respx.post(f"{settings.base_url}/auth/token").mock(
+        return_value=Response(401, json={"message": "AUTHENTICATION_FAILED"})
+    )
+
+    with pytest.raises(QPayError):
+        client.authenticate()
+    assert route.call_count == 1
+
+
+@respx.mock
+def test_refresh_network_error_is_retried_and_wrapped(monkeypatch):
+    settings = QPaySettings.sandbox(client_retries=2, client_delay=0.0, client_jitter=0.0)
+    client = QPayClient(settings=settings)
+    monkeypatch.setattr(client, "_auth_state", FakeAuthState())  # expired access, valid refresh
+    route = respx.post(f"{settings.base_url}/auth/refresh").mock(side_effect=httpx.ConnectError("boom"))
+
+    with pytest.raises(NetworkError):
+        client.authenticate()
+    assert route.call_count == 3
+
+
+@respx.mock
+def test_rejected_refresh_falls_back_to_login(client, settings):
+    wire_auth(settings)
+    refresh = respx.post(f"{settings.base_url}/auth/refresh").mock(
+        return_value=Response(401, json={"message": "AUTHENTICATION_FAILED"})
+    )
+
+    client.authenticate()
+
+    assert refresh.call_count == 1
+    assert client.token == "tok_AAA"
+
+
+@respx.mock
+def test_concurrent_threads_refresh_token_once(client, settings):
+    wire_auth(settings)
+
+    def slow_refresh(request):
+        time.sleep(0.05)  # hold the lock while the other threads pile up
+        return Response(
+            200,
+            json={
+                "access_token": "tok_AAA",
+                "refresh_token": "ref_AAA",
+                "expires_in": 3600,
+                "refresh_expires_in": 7200,
+                "token_type": "Bearer",
+                "scope": "session",
+                "not-before-policy": "1",
+                "session_state": "1",
+            },
+        )
+
+    route = respx.post(f"{settings.base_url}/auth/refresh").mock(side_effect=slow_refresh)
+
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        client.authenticate()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert route.call_count == 1
+    assert client.token == "tok_AAA"
+
+
+@respx.mock
+def test_staggered_401s_across_threads_refresh_token_once(client, settings, monkeypatch):
+    client._auth_state._access_expired = False
+
+    def cancel(request):
+        stale = request.headers["Authorization"] == "Bearer tok_initial"
+        return Response(401 if stale else 200)
+
+    route = respx.delete(url__regex=rf"{settings.base_url}/invoice/INV\d").mock(side_effect=cancel)
+    refresh = respx.post(f"{settings.base_url}/auth/refresh").mock(
+        return_value=Response(
+            200,
+            json={
+                "access_token": "tok_AAA",
+                "refresh_token": "ref_AAA",
+                "expires_in": 3600,
+                "refresh_expires_in": 7200,
+                "token_type": "Bearer",
+                "scope": "session",
+                "not-before-policy": "1",
+                "session_state": "1",
+            },
+        )
+    )
+
+    # Both requests go out with the old token; the second 401 arrives after the first refreshed it
+    send = client._transport._send
+    barrier = threading.Barrier(2)
+    sent = set()
+
+    def staggered_send(method, url, **kwargs):
+        if method == "DELETE" and url not in sent:
+            sent.add(url)
+            barrier.wait()  # first attempts only: both leave with the old token
+        response = send(method, url, **kwargs)
+        if response.status_code == 401 and url.endswith("INV1"):
+            time.sleep(0.05)
+        return response
+
+    monkeypatch.setattr(client._transport, "_send", staggered_send)
+
+    results = {}
+
+    def worker(i):
+        results[i] = client.invoice_cancel(f"INV{i}")
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == {0: 200, 1: 200}
+    assert refresh.call_count == 1
+    assert route.call_count == 4
+
+
 @respx.mock
 def test_payment_check_polls_until_count_gt_zero(client, settings):
     wire_auth(settings)
@@ -355,6 +577,8 @@ def test_payment_check_polls_until_count_gt_zero(client, settings):
     res = client.payment_check(req)
 
     assert route.call_count == 2
+    first, second = (call.request.content for call in route.calls)
+    assert first == second == req.model_dump_json(by_alias=True, exclude_none=True).encode()
     assert res.count == 1
     assert res.rows[0].payment_id == "912213777662363"
 
@@ -35,16 +35,20 @@ def test_sync_transport_replays_after_401(monkeypatch):
             return Response(401, json={"message": "expired"})
         return Response(200, json={"ok": True})
 
-    def refresh():
+    def refresh(rejected):
         calls["refresh"] += 1
+        calls["rejected"] = rejected
 
     monkeypatch.setattr(transport.client, "request", fake_request)
 
-    response = transport.request("GET", "/invoice/123", on_unauthorized=refresh)
+    response = transport.request(
+        "GET", "/invoice/123", on_unauthorized=refresh, headers={"Authorization": "Bearer tok_old"}
+    )
 
     assert response.status_code == 200
     assert calls["count"] == 2
     assert calls["refresh"] == 1
+    assert calls["rejected"] == "Bearer tok_old"
 
     transport.close()
 
@@ -154,15 +158,65 @@ async def test_async_transport_replays_after_401(monkeypatch):
             return Response(401, json={"message": "expired"})
         return Response(200, json={"ok": True})
 
-    async def refresh():
+    async def refresh(rejected):
         calls["refresh"] += 1
+        calls["rejected"] = rejected
 
     monkeypatch.setattr(transport.client, "request", fake_request)
 
-    response = await transport.request("GET", "/invoice/123", on_unauthorized=refresh)
+    response = await transport.request(
+        "GET", "/invoice/123", on_unauthorized=refresh, headers={"Authorization": "Bearer tok_old"}
+    )
 
     assert response.status_code == 200
     assert calls["count"] == 2
     assert calls["refresh"] == 1
+    assert calls["rejected"] == "Bearer tok_old"
 
     await transport.close()
+
+
+def test_sync_transport_does_not_close_injected_client():
+    shared = httpx.Client(base_url="https://merchant-sandbox.qpay.mn/v2")
+    transport = SyncTransport(
+        settings=make_settings(), logger=logging.getLogger("qpay.test.sync.shared"), client=shared
+    )
+
+    transport.close()
+
+    assert shared.is_closed is False
+    shared.close()
+
+
+@pytest.mark.asyncio
+async def test_async_transport_closes_only_its_own_client():
+    shared = httpx.AsyncClient(base_url="https://merchant-sandbox.qpay.mn/v2")
+    borrowed = AsyncTransport(
+        settings=make_settings(), logger=logging.getLogger("qpay.test.async.shared"), client=shared
+    )
+    owned = AsyncTransport(settings=make_settings(), logger=logging.getLogger("qpay.test.async.owned"))
+
+    await borrowed.close()
+    await owned.close()
+
+    assert shared.is_closed is False
+    assert owned.is_closed is True
+    await shared.aclose()
+
+
+@pytest.mark.parametrize(
+    "transport_cls, client_name",
+    [(SyncTransport, "Client"), (AsyncTransport, "AsyncClient")],
+)
+def test_transport_enables_http2_from_settings(monkeypatch, transport_cls, client_name):
+    created = {}
+
+    def fake_client(**kwargs):
+        created.update(kwargs)
+        return object()
+
+    monkeypatch.setattr(f"qpay_client.v2.transport.{client_name}", fake_client)
+
+    transport_cls(settings=make_settings(http2=True), logger=logging.getLogger("qpay.test.http2"))
+
+    assert created["http2"] is True
@@ -8,11 +8,12 @@ from qpay_client.v2.utils import exponential_backoff, handle_error, safe_json
 
 
 class DummyResponse:
-    def __init__(self, json_data=None, text="", status_code=400, raise_json=False):
+    def __init__(self, json_data=None, text="", status_code=400, raise_json=False, headers=None):
         self._json_data = json_data
         self.text = text
         self.status_code = status_code
         self._raise_json = raise_json
+        self.headers = headers if headers is not None else {"content-type": "application/json"}
 
     def json(self):
         if self._raise_json:
@@ -30,6 +31,13 @@ def test_safe_json_invalid_json():
     assert safe_json(resp) == {"message": "not json"}
 
 
+def test_safe_json_skips_decode_for_html():
+    resp = DummyResponse(
+        json_data={"decoded": True}, text="<html>502 Bad Gateway</html>", headers={"content-type": "text/html"}
+    )
+    assert safe_json(resp) == {"message": "<html>502 Bad Gateway</html>"}
+
+
 def test_handle_error_logs_and_raises(monkeypatch):
     resp = DummyResponse(json_data={"message": "error occurred"}, status_code=500)
     logger = Mock(spec=Logger)
@@ -61,3 +69,11 @@ def test_exponential_backoff():
         uncapped_min = base * (2 ** (attempt - 1))
         if uncapped_min < max_delay:
             assert uncapped_min < delay < uncapped_min + jitter
+
+
+def test_exponential_backoff_grows_and_caps():
+    delays = [exponential_backoff(0.5, attempt, jitter=0.0, max_delay=3.0) for attempt in range(1, 6)]
+    assert delays == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+    # Very large attempt counts are clamped instead of overflowing
+    assert exponential_backoff(0.5, 5000, jitter=0.0, max_delay=3.0) == 3.0